@@ -45,6 +45,9 @@ from pygmt.src import (
     grdhisteq,
     grdinfo,
     grdlandmask,
+    grdmask,
+    grdmask_batch,
+    grdmask_tiled,
     grdpaste,
     grdproject,
     grdsample,
@@ -1930,6 +1930,12 @@ class Session:
                 # non-integer/float type inputs (e.g. for string or datetime data types)
                 _virtualfile_from = self.virtualfile_from_vectors
                 _data = data.T
+            case "matrix" if data.flags.f_contiguous and not data.flags.c_contiguous:
+                # The columns of a Fortran-ordered matrix are already contiguous in
+                # memory, so pass them to GMT as vectors without copying, instead of
+                # copying the whole matrix into C order.
+                _virtualfile_from = self.virtualfile_from_vectors
+                _data = data.T
 
         # Finally create the virtualfile from the data, to be passed into GMT
         file_context = _virtualfile_from(_data)
@@ -2031,6 +2037,50 @@ class Session:
         )
         return c_inquire_virtualfile(self.session_pointer, vfname.encode())
 
+    def init_virtualfile(self, vfname: str) -> None:
+        """
+        Reset a virtual file so that it can be read or written again.
+
+        GMT marks a virtual file as used once a module has read from or written to it.
+        Resetting the virtual file allows passing the same input data to more than one
+        module call without opening a new virtual file.
+
+        Wraps ``GMT_Init_VirtualFile``.
+
+        Parameters
+        ----------
+        vfname
+            Name of the virtual file to reset.
+
+        Raises
+        ------
+        GMTCLibError
+            If the virtual file can't be reset.
+
+        Examples
+        --------
+        >>> from pygmt.clib import Session
+        >>> from pygmt.helpers import GMTTempFile
+        >>> with Session() as lib:
+        ...     with lib.virtualfile_from_vectors(([0, 1, 2], [3, 4, 5])) as vintbl:
+        ...         for _ in range(2):
+        ...             with GMTTempFile() as fout:
+        ...                 lib.call_module("info", [vintbl, f"->{fout.name}"])
+        ...                 print(fout.read().strip())
+        ...             lib.init_virtualfile(vintbl)
+        <vector memory>: N = 3 <0/2> <3/5>
+        <vector memory>: N = 3 <0/2> <3/5>
+        """
+        c_init_virtualfile = self.get_libgmt_func(
+            "GMT_Init_VirtualFile",
+            argtypes=[ctp.c_void_p, ctp.c_uint, ctp.c_char_p],  # V_API, mode, name
+            restype=ctp.c_int,
+        )
+        status = c_init_virtualfile(self.session_pointer, 0, vfname.encode())
+        if status != 0:
+            msg = f"Failed to reset virtual file {vfname!r}."
+            raise GMTCLibError(msg)
+
     def read_virtualfile(
         self,
         vfname: str,
@@ -177,10 +177,11 @@ class _GMT_GRID(ctp.Structure):  # noqa: N801
         y = np.ctypeslib.as_array(self.y, shape=(header.n_rows,)).copy()
         coords = [(dims[0], y, dim_attrs[0]), (dims[1], x, dim_attrs[1])]
 
-        # The data array without paddings
-        data = np.ctypeslib.as_array(self.data, shape=(header.my, header.mx)).copy()
+        # The data array without paddings. Only copy the data after removing the
+        # paddings, so that the padded array isn't copied and kept alive by the view.
+        data = np.ctypeslib.as_array(self.data, shape=(header.my, header.mx))
         pad = header.pad[:]
-        data = data[pad[2] : header.my - pad[3], pad[0] : header.mx - pad[1]]
+        data = data[pad[2] : header.my - pad[3], pad[0] : header.mx - pad[1]].copy()
 
         # Create the xarray.DataArray object
         grid = xr.DataArray(
@@ -197,12 +197,12 @@ class _GMT_IMAGE(ctp.Structure):  # noqa: N801
             ("band", np.array([1, 2, 3], dtype=np.uint8), None),
         ]
 
-        # Get DataArray without padding
+        # Get DataArray without padding. Only copy the data after removing the padding.
         data = np.ctypeslib.as_array(
             self.data, shape=(header.my, header.mx, header.n_bands)
-        ).copy()
+        )
         pad = header.pad[:]
-        data = data[pad[2] : header.my - pad[3], pad[0] : header.mx - pad[1], :]
+        data = data[pad[2] : header.my - pad[3], pad[0] : header.mx - pad[1], :].copy()
 
         # Create the xarray.DataArray object
         image = xr.DataArray(
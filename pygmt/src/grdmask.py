@@ -0,0 +1,822 @@
+"""
+grdmask - Create mask grid from polygons or point coverage.
+"""
+
+import contextlib
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Generator, Hashable, Iterable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import xarray as xr
+from pygmt._typing import PathLike, TableLike
+from pygmt.alias import Alias, AliasSystem
+from pygmt.clib import Session
+from pygmt.enums import GridRegistration, GridType
+from pygmt.exceptions import GMTParameterError, GMTValueError
+from pygmt.helpers import build_arg_list, fmt_docstring, is_nonstr_iter
+
+__doctest_skip__ = ["grdmask", "grdmask_batch", "grdmask_tiled"]
+
+# Cache of grdmask results for repeated calls with the same inputs, ordered from the
+# least to the most recently used.
+_GRDMASK_CACHE: OrderedDict[Hashable, xr.DataArray] = OrderedDict()
+_GRDMASK_CACHE_SIZE = 128
+_GRDMASK_CACHE_LOCK = threading.Lock()
+
+
+def _classify(value: float | str) -> str:
+    """
+    Classify a mask value as one of the special modes ("z" or "id") or a number.
+    """
+    return value if value in {"z", "id"} else "num"  # type: ignore[return-value]
+
+
+def _suffix(outside: float | str) -> str:
+    """
+    The optional outside value appended to the "z" and "id" modes of -N.
+    """
+    return f"/{outside}" if outside != 0 else ""
+
+
+def _start(id_start: float) -> str:
+    """
+    The optional start of the polygon IDs appended to the "id" mode of -N.
+    """
+    return f"{id_start}" if id_start != 0 else ""
+
+
+# Dispatch table for the -N option, mapping the kinds of the (outside, edge, inside)
+# values to a function that formats the option argument from the (outside, edge,
+# inside, id_start) values. Combinations not in the table are invalid.
+_N_DISPATCH = {
+    ("num", "num", "num"): lambda o, e, i, _s: f"{o}/{e}/{i}",
+    ("num", "num", "z"): lambda o, _e, _i, _s: f"z{_suffix(o)}",
+    ("num", "z", "z"): lambda o, _e, _i, _s: f"Z{_suffix(o)}",
+    ("num", "num", "id"): lambda o, _e, _i, s: f"p{_start(s)}{_suffix(o)}",
+    ("num", "id", "id"): lambda o, _e, _i, s: f"P{_start(s)}{_suffix(o)}",
+}
+
+
+@functools.lru_cache(maxsize=128, typed=True)
+def _alias_option_N(  # noqa: N802
+    outside: float | Literal["z", "id"] = 0,
+    edge: float | Literal["z", "id"] = 0,
+    inside: float | Literal["z", "id"] = 1,
+    id_start: float = 0,
+) -> Alias:
+    """
+    Return an Alias object for the -N option.
+
+    Examples
+    --------
+    >>> def parse(**kwargs):
+    ...     return AliasSystem(N=_alias_option_N(**kwargs)).get("N")
+    >>> parse()
+    '0/0/1'
+    >>> parse(outside="NaN", edge=0.5, inside=2)
+    'NaN/0.5/2'
+    >>> parse(inside="z")
+    'z'
+    >>> parse(inside="z", edge="z")
+    'Z'
+    >>> parse(outside="NaN", inside="z")
+    'z/NaN'
+    >>> parse(inside="id")
+    'p'
+    >>> parse(inside="id", edge="id", id_start=10)
+    'P10'
+    >>> parse(outside=-1, inside="id", id_start=10)
+    'p10/-1'
+    >>> parse(inside="z", edge="id")
+    Traceback (most recent call last):
+    ...
+    pygmt.exceptions.GMTValueError: Invalid value for parameter 'edge': 'id'. ...
+    >>> parse(outside="z", inside=1)
+    Traceback (most recent call last):
+    ...
+    pygmt.exceptions.GMTValueError: Invalid value for parameter 'outside': 'z'. ...
+    """
+    key = (_classify(outside), _classify(edge), _classify(inside))
+    if (formatter := _N_DISPATCH.get(key)) is None:
+        name, value = ("outside", outside) if key[0] != "num" else ("edge", edge)
+        raise GMTValueError(
+            value,
+            description=f"value for parameter {name!r}",
+            reason="Only 'inside' can be set to 'z' or 'id', and 'edge' can only be "
+            "set to the same value as 'inside'.",
+        )
+    return Alias(formatter(outside, edge, inside, id_start), name="mask_values")
+
+
+def _grdmask_aliasdict(
+    spacing: Sequence[float | str] | None,
+    region: Sequence[float | str] | str | None,
+    mask_values: tuple,
+    registration: Literal["gridline", "pixel"] | bool,
+    verbose: Literal["quiet", "error", "warning", "timing", "info", "compat", "debug"]
+    | bool,
+    cores: int | bool,
+    kwargs: dict,
+) -> AliasSystem:
+    """
+    Build the alias dictionary shared by grdmask and grdmask_batch.
+
+    ``mask_values`` is the tuple of (*outside*, *edge*, *inside*, *id_start*). The
+    Alias for the -N option is cached, since the same mask values are typically used
+    for many calls.
+
+    Examples
+    --------
+    >>> def parse(**kwargs):
+    ...     return dict(
+    ...         _grdmask_aliasdict(
+    ...             spacing=kwargs.pop("spacing", 1),
+    ...             region=kwargs.pop("region", [0, 10, 0, 10]),
+    ...             mask_values=kwargs.pop("mask_values", (0, 0, 1, 0)),
+    ...             registration=kwargs.pop("registration", False),
+    ...             verbose=kwargs.pop("verbose", False),
+    ...             cores=kwargs.pop("cores", False),
+    ...             kwargs=kwargs,
+    ...         )
+    ...     )
+    >>> parse()
+    {'I': '1', 'N': '0/0/1', 'R': '0/10/0/10'}
+    >>> parse(spacing=[1, 2], mask_values=(0, "z", "z", 0), verbose="info", j="e")
+    {'I': '1/2', 'N': 'Z', 'R': '0/10/0/10', 'V': 'i', 'j': 'e'}
+    """
+    outside, edge, inside, id_start = mask_values
+    aliasdict = AliasSystem(
+        I=Alias(spacing, name="spacing", sep="/", size=2),
+        N=_alias_option_N(outside=outside, edge=edge, inside=inside, id_start=id_start),
+    ).add_common(
+        R=region,
+        V=verbose,
+        r=registration,
+        x=cores,
+    )
+    aliasdict.merge(kwargs)
+    return aliasdict
+
+
+def _data_digest(data: PathLike | TableLike) -> Hashable | None:
+    """
+    Return a hashable digest of the input data, or None if it can't be cached.
+
+    Numeric arrays are digested by their contents, and files by their path and
+    modification time. Other types of data, including object arrays whose bytes are
+    pointers rather than values, are not cached.
+
+    Examples
+    --------
+    >>> polygon = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0]])
+    >>> _data_digest(polygon) == _data_digest(polygon.copy())
+    True
+    >>> _data_digest(polygon) == _data_digest(polygon.astype(np.float32))
+    False
+    >>> _data_digest("@remote_file.txt")
+    ('@remote_file.txt', None)
+    >>> _data_digest(polygon.astype(object)) is None
+    True
+    >>> _data_digest({"x": [0, 1, 1], "y": [0, 0, 1]}) is None
+    True
+    """
+    if isinstance(data, np.ndarray):
+        if data.dtype.kind not in "iufb":
+            return None
+        digest = hashlib.blake2b(np.ascontiguousarray(data).tobytes()).digest()
+        return (digest, data.shape, data.dtype.str)
+    if isinstance(data, str | Path):
+        path = Path(data)
+        return (str(data), path.stat().st_mtime_ns if path.is_file() else None)
+    return None
+
+
+def _can_prefilter(inside: float | str, kwargs: dict) -> bool:
+    """
+    Check if the polygons can be dropped by their bounding boxes before masking.
+
+    A bounding box only contains its polygon when the polygon sides are straight lines
+    in Cartesian coordinates. Geographic data (``-f``, ``-j``) are joined along great
+    circles, which can leave the bounding box of the vertices, and points with a search
+    radius (``-S``) mask nodes outside their bounding box. Dropping polygons would also
+    renumber the polygon IDs of ``inside="id"`` or a raw ``-N`` option.
+
+    Examples
+    --------
+    >>> _can_prefilter(inside=1, kwargs={})
+    True
+    >>> _can_prefilter(inside="id", kwargs={})
+    False
+    >>> _can_prefilter(inside=1, kwargs={"f": "g"})
+    False
+    >>> _can_prefilter(inside=1, kwargs={"S": "1k"})
+    False
+    >>> _can_prefilter(inside=1, kwargs={"N": "p"})
+    False
+    """
+    return inside != "id" and not {"f", "j", "S", "N"} & kwargs.keys()
+
+
+def _prefilter_by_region(
+    data: PathLike | TableLike, region: Sequence[float | str] | str | None
+) -> PathLike | TableLike:
+    """
+    Drop the polygons whose bounding box doesn't intersect the region.
+
+    Only applies to 2-D floating-point arrays, in which polygons are separated by rows
+    of NaNs. The bounding boxes of all polygons are computed at once, and the polygons
+    that are shifted by 360 degrees into the region are kept so that geographic
+    longitudes in a different range aren't dropped. Polygons spanning 180 degrees or
+    more in x are always kept, since geographic polygons that enclose a pole or cross
+    the dateline can cover the region even when their bounding box doesn't (a ring
+    around a pole has no gap of 180 degrees or more between its longitudes, so it
+    always spans more than 180 degrees). The input data is returned
+    unchanged if it isn't such an array, if the region isn't given as numbers, or if all
+    or none of the polygons intersect the region.
+
+    Examples
+    --------
+    >>> data = np.array(
+    ...     [
+    ...         [0.0, 0.0],
+    ...         [1.0, 0.0],
+    ...         [1.0, 1.0],
+    ...         [np.nan, np.nan],
+    ...         [10.0, 10.0],
+    ...         [11.0, 10.0],
+    ...         [11.0, 11.0],
+    ...         [np.nan, np.nan],
+    ...         [-359.5, 0.5],
+    ...         [-359.0, 0.5],
+    ...         [-359.0, 1.0],
+    ...     ]
+    ... )
+    >>> _prefilter_by_region(data, region=[0, 2, 0, 2])
+    array([[   0. ,    0. ],
+           [   1. ,    0. ],
+           [   1. ,    1. ],
+           [   nan,    nan],
+           [-359.5,    0.5],
+           [-359. ,    0.5],
+           [-359. ,    1. ]])
+    >>> _prefilter_by_region(data, region=[10, 12, 9, 12])
+    array([[10., 10.],
+           [11., 10.],
+           [11., 11.],
+           [nan, nan]])
+    >>> _prefilter_by_region(data, region=[-5, 20, -5, 20]) is data
+    True
+    >>> _prefilter_by_region(data, region=[50, 60, 50, 60]) is data
+    True
+    >>> # A ring at latitude -80 enclosing the South Pole is kept
+    >>> ring = np.array([[-180.0, -80.0], [-60.0, -80.0], [60.0, -80.0]])
+    >>> polar = np.vstack([ring, [np.nan, np.nan], data])
+    >>> _prefilter_by_region(polar, region=[-10, 10, -90, -85])
+    array([[-180.,  -80.],
+           [ -60.,  -80.],
+           [  60.,  -80.],
+           [  nan,   nan]])
+    >>> _prefilter_by_region(data, region="g") is data
+    True
+    >>> _prefilter_by_region("polygons.txt", region=[0, 2, 0, 2])
+    'polygons.txt'
+    """
+    if not (
+        isinstance(data, np.ndarray)
+        and data.ndim == 2
+        and data.shape[1] >= 2
+        and data.dtype.kind == "f"
+    ):
+        return data
+    try:
+        west, east, south, north = np.asarray(region, dtype=np.float64)
+    except (TypeError, ValueError):  # Region like "g", "US.TX" or with modifiers.
+        return data
+
+    nrows = data.shape[0]
+    x, y = data[:, 0], data[:, 1]
+    # Each polygon starts after a NaN row. A polygon's bounding box also covers the NaN
+    # row after it, which doesn't matter since fmin/fmax ignore NaNs.
+    starts = np.flatnonzero(np.isnan(x) | np.isnan(y)) + 1
+    starts = np.concatenate([[0], starts[starts < nrows]])
+    xmin, xmax = np.fmin.reduceat(x, starts), np.fmax.reduceat(x, starts)
+    ymin, ymax = np.fmin.reduceat(y, starts), np.fmax.reduceat(y, starts)
+
+    keep = (ymax >= south) & (ymin <= north)
+    keep &= (
+        ((xmax >= west) & (xmin <= east))
+        | ((xmax + 360 >= west) & (xmin + 360 <= east))
+        | ((xmax - 360 >= west) & (xmin - 360 <= east))
+    )
+    keep |= xmax - xmin >= 180
+    if keep.all() or not keep.any():
+        return data
+    # Map the polygon mask back to the rows, including the NaN separator rows.
+    return data[np.repeat(keep, np.diff(starts, append=nrows))]
+
+
+def _copy_grid(grid: xr.DataArray) -> xr.DataArray:
+    """
+    Return a copy of the grid that keeps the GMT-specific properties.
+    """
+    copy = grid.copy()
+    copy.gmt.registration = grid.gmt.registration
+    copy.gmt.gtype = grid.gmt.gtype
+    return copy
+
+
+def _grdmask_inside_session(
+    lib: Session, vintbl: str, aliasdict: AliasSystem, outgrid: PathLike | None = None
+) -> xr.DataArray | None:
+    """
+    Run grdmask on an already opened input file within an existing GMT session.
+    """
+    with lib.virtualfile_out(kind="grid", fname=outgrid) as voutgrd:
+        aliasdict["G"] = voutgrd
+        lib.call_module(module="grdmask", args=build_arg_list(aliasdict, infile=vintbl))
+        return lib.virtualfile_to_raster(vfname=voutgrd, outgrid=outgrid)
+
+
+def _virtualfile_in(
+    lib: Session, data: PathLike | TableLike
+) -> contextlib.AbstractContextManager[str]:
+    """
+    Store the polygon data in a virtual file.
+
+    C-contiguous float64 arrays with 2 or 3 columns (x, y[, z]) are the most common
+    input, and they can be passed to GMT as a matrix without copying, so skip the data
+    kind detection and validation of :meth:`pygmt.clib.Session.virtualfile_in` for
+    them. Other data, including Fortran-ordered arrays, are passed to
+    :meth:`pygmt.clib.Session.virtualfile_in`.
+    """
+    if (
+        isinstance(data, np.ndarray)
+        and data.ndim == 2
+        and data.shape[1] in {2, 3}
+        and data.dtype == np.float64
+        and data.flags.c_contiguous
+    ):
+        return lib.virtualfile_from_matrix(data)
+    return lib.virtualfile_in(check_kind="vector", data=data)
+
+
+def _grdmask_batch(
+    pairs: Iterable[tuple[PathLike | TableLike, str | None]],
+    aliasdict: AliasSystem,
+    outgrid: PathLike | None = None,
+) -> Generator[xr.DataArray | None, None, None]:
+    """
+    Run grdmask on a sequence of (data, region) pairs within a single GMT session.
+
+    The input virtual file is only created again when the data changes, so the same
+    polygons can be masked onto many regions without being converted again. A region
+    of ``None`` means using the region already set in ``aliasdict``.
+    """
+    with Session() as lib, contextlib.ExitStack() as stack:
+        last_data, vintbl = None, None
+        for data, region in pairs:
+            if vintbl is not None and data is last_data:
+                # GMT can only read a virtual file once, so reset it before reusing.
+                # Files and other non-virtual inputs are passed through by name.
+                if vintbl.startswith("@GMTAPI@"):
+                    lib.init_virtualfile(vintbl)
+            else:
+                stack.close()  # Close the virtual file of the previous data.
+                vintbl = stack.enter_context(_virtualfile_in(lib, data))
+                last_data = data
+            if region is not None:
+                aliasdict["R"] = region
+            yield _grdmask_inside_session(lib, vintbl, aliasdict, outgrid=outgrid)
+
+
+@fmt_docstring
+def grdmask(  # noqa: PLR0913
+    data: PathLike | TableLike,
+    outgrid: PathLike | None = None,
+    spacing: Sequence[float | str] | None = None,
+    region: Sequence[float | str] | str | None = None,
+    outside: float | Literal["z", "id"] = 0,
+    edge: float | Literal["z", "id"] = 0,
+    inside: float | Literal["z", "id"] = 1,
+    id_start: float = 0,
+    registration: Literal["gridline", "pixel"] | bool = False,
+    verbose: Literal["quiet", "error", "warning", "timing", "info", "compat", "debug"]
+    | bool = False,
+    cores: int | bool = False,
+    cache: bool = False,
+    prefilter: bool = True,
+    **kwargs,
+) -> xr.DataArray | None:
+    r"""
+    Create mask grid from polygons or point coverage.
+
+    Read one or more files (or a table) containing closed polygon coordinates, and
+    create a grid where nodes that fall inside, on the edge, or outside the polygons
+    are assigned the values given by ``inside``, ``edge``, and ``outside``,
+    respectively.
+
+    Full GMT docs at :gmt-docs:`grdmask.html`.
+
+    **Aliases:**
+
+    .. hlist::
+       :columns: 3
+
+       - G = outgrid
+       - I = spacing
+       - N = outside/edge/inside/id_start
+       - R = region
+       - V = verbose
+       - r = registration
+       - x = cores
+
+    Parameters
+    ----------
+    data
+        Pass in the polygon coordinates by providing either a file name to an ASCII
+        data table, a 2-D $table_classes. Multiple polygons are separated by a row of
+        NaNs or by segment headers in a file.
+    $outgrid
+    $spacing
+    outside
+    edge
+    inside
+        Values assigned to nodes that are outside the polygons, on the polygon edges,
+        or inside the polygons. Values can be any number or ``"NaN"``. ``inside`` can
+        also be set to ``"z"`` to use the z-value of each polygon (from the segment
+        header or the third column), or ``"id"`` to use a running polygon ID starting
+        at ``id_start``. In these two modes, set ``edge`` to the same value as
+        ``inside`` to treat nodes on the edges as inside nodes; otherwise they are
+        treated as outside nodes. Default is ``0``, ``0``, and ``1``.
+    id_start
+        Start of the running polygon ID when ``inside="id"``.
+    $region
+    $registration
+    $verbose
+    $cores
+    cache
+        If ``True``, keep the output grid in memory and return a copy of it when
+        :func:`pygmt.grdmask` is called again with the same data and parameters,
+        instead of running GMT again. Only arrays and files can be cached, and the
+        results of the 128 most recent calls are kept. Ignored if ``outgrid`` is set.
+    prefilter
+        If ``True``, drop the polygons that lie completely outside of ``region`` before
+        passing them to GMT. Only used when ``data`` is a :class:`numpy.ndarray` with
+        polygons separated by rows of NaNs and ``region`` is given as numbers. Ignored
+        for geographic data or point coverage (i.e., if ``f``, ``j``, or ``S`` is
+        given), where polygons can cover nodes outside the bounding box of their
+        vertices, and for polygon IDs (``inside="id"`` or ``N`` given), which would
+        change if polygons were dropped.
+
+    Returns
+    -------
+    ret
+        Return type depends on whether the ``outgrid`` parameter is set:
+
+        - :class:`xarray.DataArray` if ``outgrid`` is not set
+        - ``None`` if ``outgrid`` is set (grid output will be stored in the file set by
+          ``outgrid``)
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import pygmt
+    >>> # Create a mask grid where nodes inside the square are set to 1
+    >>> polygon = np.array([[126.5, 31.5], [128.5, 31.5], [128.5, 33.5], [126.5, 33.5]])
+    >>> mask = pygmt.grdmask(data=polygon, spacing=1, region=[125, 130, 30, 35])
+    """
+    if kwargs.get("I", spacing) is None or kwargs.get("R", region) is None:
+        raise GMTParameterError(required=["region", "spacing"])
+
+    aliasdict = _grdmask_aliasdict(
+        spacing=spacing,
+        region=region,
+        mask_values=(outside, edge, inside, id_start),
+        registration=registration,
+        verbose=verbose,
+        cores=cores,
+        kwargs=kwargs,
+    )
+
+    key = None
+    if cache and outgrid is None and (digest := _data_digest(data)) is not None:
+        key = (digest, tuple(build_arg_list(aliasdict)))
+        with _GRDMASK_CACHE_LOCK:
+            cached = _GRDMASK_CACHE.get(key)
+            if cached is not None:
+                _GRDMASK_CACHE.move_to_end(key)
+        if cached is not None:
+            return _copy_grid(cached)
+
+    if prefilter and _can_prefilter(inside, kwargs):
+        data = _prefilter_by_region(data, region=kwargs.get("R", region))
+
+    (result,) = _grdmask_batch([(data, None)], aliasdict, outgrid=outgrid)
+    if key is not None:
+        cached = _copy_grid(result)
+        with _GRDMASK_CACHE_LOCK:
+            _GRDMASK_CACHE[key] = cached
+            if len(_GRDMASK_CACHE) > _GRDMASK_CACHE_SIZE:
+                _GRDMASK_CACHE.popitem(last=False)
+    return result
+
+
+@fmt_docstring
+def grdmask_batch(
+    data_iter: Iterable[PathLike | TableLike],
+    spacing: Sequence[float | str] | None = None,
+    region: Sequence[float | str] | Sequence[Sequence[float | str]] | str | None = None,
+    outside: float | Literal["z", "id"] = 0,
+    edge: float | Literal["z", "id"] = 0,
+    inside: float | Literal["z", "id"] = 1,
+    id_start: float = 0,
+    registration: Literal["gridline", "pixel"] | bool = False,
+    verbose: Literal["quiet", "error", "warning", "timing", "info", "compat", "debug"]
+    | bool = False,
+    cores: int | bool = False,
+    **kwargs,
+) -> Generator[xr.DataArray, None, None]:
+    r"""
+    Create many mask grids from polygons within a single GMT session.
+
+    Same as :func:`pygmt.grdmask`, but masks each item of ``data_iter`` in turn and
+    yields the resulting grids one by one. The GMT session is only created once, and
+    consecutive items that are the same object share one input virtual file, which
+    makes masking many small grids much faster than calling :func:`pygmt.grdmask`
+    repeatedly.
+
+    Parameters
+    ----------
+    data_iter
+        An iterable of polygon data. Each item can be anything accepted by the ``data``
+        parameter of :func:`pygmt.grdmask`.
+    $spacing
+    region
+        *xmin/xmax/ymin/ymax*\ [**+r**][**+u**\ *unit*].
+        Specify the :doc:`region </tutorials/basics/regions>` of interest. Either a
+        single region applied to all items, or a sequence of regions (each given as a
+        list) with one region for each item of ``data_iter``.
+    outside
+    edge
+    inside
+    id_start
+        See :func:`pygmt.grdmask`.
+    $registration
+    $verbose
+    $cores
+
+    Yields
+    ------
+    grid
+        The mask grid for each item of ``data_iter``.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import pygmt
+    >>> polygon = np.array([[126.5, 31.5], [128.5, 31.5], [128.5, 33.5], [126.5, 33.5]])
+    >>> # Mask the same polygon onto two neighboring tiles
+    >>> tiles = [[125, 130, 30, 35], [125, 130, 35, 40]]
+    >>> masks = list(
+    ...     pygmt.grdmask_batch(data_iter=[polygon] * 2, spacing=1, region=tiles)
+    ... )
+    """
+    if kwargs.get("I", spacing) is None or kwargs.get("R", region) is None:
+        raise GMTParameterError(required=["region", "spacing"])
+
+    # A sequence of regions, one for each item of data_iter.
+    regions = None
+    if is_nonstr_iter(region) and is_nonstr_iter(region[0]):  # type: ignore[index]
+        regions = [
+            Alias(_region, name="region", sep="/", size=(4, 6))._value
+            for _region in region  # type: ignore[union-attr]
+        ]
+        region = None
+
+    aliasdict = _grdmask_aliasdict(
+        spacing=spacing,
+        region=region,
+        mask_values=(outside, edge, inside, id_start),
+        registration=registration,
+        verbose=verbose,
+        cores=cores,
+        kwargs=kwargs,
+    )
+
+    pairs = (
+        zip(data_iter, regions, strict=True)
+        if regions is not None
+        else ((data, None) for data in data_iter)
+    )
+    return _grdmask_batch(pairs, aliasdict)  # type: ignore[arg-type]
+
+
+def _split_region(
+    region: Sequence[float | str] | str | None,
+    spacing: Sequence[float | str] | float | str | None,
+    registration: Literal["gridline", "pixel"] | bool,
+    ntiles: int,
+) -> list[list[float]] | None:
+    """
+    Split a region into horizontal bands that are aligned with the grid rows.
+
+    Each band has at least two rows, and no row is shared between bands. The band
+    bounds are rounded to the decimals of the southern bound and the spacing, so that
+    they match the coordinates of the full grid. Returns ``None`` if the region or the
+    spacing isn't given as numbers.
+
+    Examples
+    --------
+    >>> _split_region([0, 10, 0, 10], spacing=1, registration=False, ntiles=3)
+    [[0.0, 10.0, 0.0, 3.0], [0.0, 10.0, 4.0, 7.0], [0.0, 10.0, 8.0, 10.0]]
+    >>> _split_region([0, 10, 0, 10], spacing=[1, 2], registration="pixel", ntiles=2)
+    [[0.0, 10.0, 0.0, 6.0], [0.0, 10.0, 6.0, 10.0]]
+    >>> # Too many tiles for the number of rows
+    >>> _split_region([0, 10, 0, 3], spacing=1, registration=False, ntiles=8)
+    [[0.0, 10.0, 0.0, 1.0], [0.0, 10.0, 2.0, 3.0]]
+    >>> _split_region([-90, 90, -90, 90], spacing=0.1, registration=False, ntiles=2)
+    [[-90.0, 90.0, -90.0, 0.0], [-90.0, 90.0, 0.1, 90.0]]
+    >>> _split_region([0, 10, 0, 10.5], spacing=1, registration=False, ntiles=2)
+    Traceback (most recent call last):
+    ...
+    pygmt.exceptions.GMTValueError: Invalid region: [0, 10, 0, 10.5]. ...
+    >>> _split_region("g", spacing=1, registration=False, ntiles=2) is None
+    True
+    >>> _split_region([0, 10, 0, 10], spacing="1m", registration=False, ntiles=2)
+    """
+    try:
+        west, east, south, north = np.asarray(region, dtype=np.float64).tolist()
+        yinc = float(np.asarray(spacing, dtype=np.float64).ravel()[-1])
+    except (TypeError, ValueError):
+        return None
+
+    nincs = (north - south) / yinc
+    if not np.isclose(nincs, round(nincs)):
+        raise GMTValueError(
+            region,
+            description="region",
+            reason=f"The y range must be a whole multiple of the y spacing {yinc}.",
+        )
+    decimals = max(
+        len(np.format_float_positional(value).partition(".")[2])
+        for value in (south, yinc)
+    )
+
+    is_pixel = registration in {"pixel", "p", True}
+    nrows = round(nincs) + (0 if is_pixel else 1)
+    bands = np.array_split(np.arange(nrows), max(min(ntiles, nrows // 2), 1))
+    # Pixel-registered bands extend to the top of the last cell.
+    top = 1 if is_pixel else 0
+    return [
+        [
+            west,
+            east,
+            round(south + int(rows[0]) * yinc, decimals),
+            round(south + int(rows[-1] + top) * yinc, decimals),
+        ]
+        for rows in bands
+    ]
+
+
+def _grdmask_band(**kwargs) -> tuple[xr.DataArray, GridRegistration, GridType]:
+    """
+    Mask one band of grdmask_tiled.
+
+    The grid registration and type are returned alongside the grid, since the
+    properties of the GMT accessor are lost when the grid is pickled back from a worker
+    process.
+    """
+    grid = grdmask(**kwargs)
+    return grid, grid.gmt.registration, grid.gmt.gtype
+
+
+def grdmask_tiled(
+    data: PathLike | TableLike,
+    spacing: Sequence[float | str] | None = None,
+    region: Sequence[float | str] | None = None,
+    ntiles: int | None = None,
+    executor: Executor | None = None,
+    **kwargs,
+) -> xr.DataArray:
+    r"""
+    Create a mask grid by masking horizontal bands of the region separately.
+
+    The region is split into ``ntiles`` bands of grid rows. Each band is masked by
+    :func:`pygmt.grdmask` in its own GMT session, with the polygons outside the band
+    dropped beforehand, and the bands are then concatenated into a single grid. The
+    bands can be masked in parallel in separate processes by passing ``executor``,
+    which speeds up masking large grids on multi-core machines. Without ``executor``,
+    splitting the region only adds overhead, so the region is masked by a single call
+    to :func:`pygmt.grdmask` unless ``ntiles`` is given.
+
+    Parameters
+    ----------
+    data
+        The polygon data. See :func:`pygmt.grdmask`.
+    spacing
+        *x_inc*\ [/*y_inc*].
+        Grid spacing. Must be given as numbers in the units of the region.
+    region
+        *xmin/xmax/ymin/ymax*.
+        The region of the grid, given as a sequence of four numbers.
+    ntiles
+        Number of bands to split the region into. Default is the number of CPUs if
+        ``executor`` is given, or 1 otherwise. The number of bands is reduced if the
+        grid doesn't have enough rows.
+    executor
+        A :class:`concurrent.futures.ProcessPoolExecutor` for masking the bands in
+        parallel. Default is to mask the bands one after another in the current
+        process. GMT sessions aren't thread-safe, so a
+        :class:`concurrent.futures.ThreadPoolExecutor` is not supported. PyGMT must be
+        re-imported in each worker process, e.g., with an ``initializer`` that calls
+        :func:`importlib.reload` on :mod:`pygmt` (see
+        https://github.com/GenericMappingTools/pygmt/issues/217).
+    **kwargs
+        Other parameters passed to :func:`pygmt.grdmask` (e.g., ``outside``,
+        ``inside``, ``registration``). ``outgrid`` is not supported.
+
+    Returns
+    -------
+    ret
+        The mask grid.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import pygmt
+    >>> polygon = np.array([[-150, -60], [150, -60], [150, 60], [-150, 60]])
+    >>> mask = pygmt.grdmask_tiled(
+    ...     data=polygon, spacing=0.1, region=[-180, 180, -90, 90], ntiles=4
+    ... )
+    """
+    if spacing is None or region is None:
+        raise GMTParameterError(required=["region", "spacing"])
+    if "outgrid" in kwargs or "G" in kwargs:
+        raise GMTParameterError(
+            reason="Parameter 'outgrid' is not supported. Use pygmt.grdmask instead."
+        )
+
+    if ntiles is None:
+        # Splitting the region only pays off if the bands are masked in parallel.
+        ntiles = (os.cpu_count() or 1) if executor is not None else 1
+    registration = kwargs.get("registration", kwargs.get("r", False))
+    subregions = _split_region(region, spacing, registration, ntiles=ntiles)
+    if subregions is None:
+        raise GMTValueError(
+            region,
+            description="region",
+            reason="'region' and 'spacing' must be given as numbers.",
+        )
+
+    if isinstance(executor, ThreadPoolExecutor):
+        raise GMTValueError(
+            executor,
+            description="executor",
+            reason="GMT sessions aren't thread-safe. Use a ProcessPoolExecutor instead.",
+        )
+
+    if len(subregions) == 1:
+        return grdmask(data=data, spacing=spacing, region=region, **kwargs)
+
+    prefilter = kwargs.pop("prefilter", True) and _can_prefilter(
+        kwargs.get("inside", 1), kwargs
+    )
+    bands = [
+        {
+            "data": _prefilter_by_region(data, subregion) if prefilter else data,
+            "spacing": spacing,
+            "region": subregion,
+            "prefilter": False,  # Already filtered above.
+            **kwargs,
+        }
+        for subregion in subregions
+    ]
+    if executor is None:
+        results = [_grdmask_band(**band) for band in bands]
+    else:
+        futures = [executor.submit(_grdmask_band, **band) for band in bands]
+        results = [future.result() for future in futures]
+
+    tiles, (_, registration, gtype) = [result[0] for result in results], results[0]
+    ydim = tiles[0].dims[0]
+    grid = xr.concat(tiles, dim=ydim)
+    # xr.concat keeps the attributes of the first band, so update the ranges to cover
+    # the bands from the southernmost to the northernmost one.
+    grid[ydim].attrs["actual_range"] = np.array(
+        [
+            tiles[0][ydim].attrs["actual_range"][0],
+            tiles[-1][ydim].attrs["actual_range"][1],
+        ]
+    )
+    if "actual_range" in grid.attrs:
+        grid.attrs["actual_range"] = np.array([float(grid.min()), float(grid.max())])
+    grid.gmt.registration = registration
+    grid.gmt.gtype = gtype
+    return grid
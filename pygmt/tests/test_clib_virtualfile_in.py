@@ -144,6 +144,26 @@ def test_virtualfile_in_matrix_string_dtype():
                 # not lib.virtualfile_from_matrix, but it's technically complicated.
 
 
+def test_virtualfile_in_matrix_fortran_order(data):
+    """
+    Pass a Fortran-ordered matrix should work and give the same result as the
+    C-ordered matrix, with the columns passed as vectors without copying.
+    """
+    fdata = np.asfortranarray(data)
+    assert data_kind(fdata) == "matrix"  # data is recognized as "matrix" kind
+    assert fdata.flags.f_contiguous
+    assert not fdata.flags.c_contiguous
+
+    outputs = []
+    with clib.Session() as lib:
+        for array in (data, fdata):
+            with lib.virtualfile_in(data=array) as vintbl:
+                with GMTTempFile() as outfile:
+                    lib.call_module("info", [vintbl, "-C", f"->{outfile.name}"])
+                    outputs.append(outfile.read(keep_tabs=False))
+    assert outputs[0] == outputs[1]
+
+
 # TODO(PyGMT>=0.20.0): Remove the test related to deprecated parameter 'extra_arrays'.
 def test_virtualfile_in_extra_arrays(data):
     """
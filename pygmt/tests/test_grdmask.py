@@ -0,0 +1,352 @@
+"""
+Test pygmt.grdmask, pygmt.grdmask_batch, and pygmt.grdmask_tiled.
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib import reload
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import pytest
+import xarray as xr
+from pygmt import grdmask, grdmask_batch, grdmask_tiled
+from pygmt.clib import Session
+from pygmt.enums import GridRegistration
+from pygmt.exceptions import GMTParameterError, GMTValueError
+from pygmt.helpers import GMTTempFile
+from pygmt.src.grdmask import _GRDMASK_CACHE, _prefilter_by_region
+
+
+@pytest.fixture(scope="module", name="polygon")
+def fixture_polygon():
+    """
+    A closed square polygon with no grid nodes on its edges.
+    """
+    return np.array(
+        [[126.5, 31.5], [128.5, 31.5], [128.5, 33.5], [126.5, 33.5], [126.5, 31.5]]
+    )
+
+
+@pytest.fixture(scope="module", name="expected_mask")
+def fixture_expected_mask():
+    """
+    The expected mask values for the square polygon.
+    """
+    mask = np.zeros(shape=(6, 6))
+    mask[2:4, 2:4] = 1.0
+    return mask
+
+
+def test_grdmask_outgrid(polygon, expected_mask):
+    """
+    Create a mask grid with an outgrid argument.
+    """
+    with GMTTempFile(suffix=".nc") as tmpfile:
+        result = grdmask(
+            data=polygon, outgrid=tmpfile.name, spacing=1, region=[125, 130, 30, 35]
+        )
+        assert result is None  # return value is None
+        assert Path(tmpfile.name).stat().st_size > 0  # check that outgrid exists
+        temp_grid = xr.load_dataarray(tmpfile.name, engine="gmt", raster_kind="grid")
+        npt.assert_allclose(temp_grid.values, expected_mask)
+
+
+@pytest.mark.benchmark
+def test_grdmask_no_outgrid(polygon, expected_mask):
+    """
+    Test grdmask with no set outgrid.
+    """
+    result = grdmask(data=polygon, spacing=1, region=[125, 130, 30, 35])
+    assert isinstance(result, xr.DataArray)
+    assert result.gmt.registration is GridRegistration.GRIDLINE
+    npt.assert_allclose(result.values, expected_mask)
+
+
+@pytest.mark.parametrize(
+    ("array_func", "method", "generic"),
+    [
+        (np.ascontiguousarray, "virtualfile_from_matrix", False),
+        (np.asfortranarray, "virtualfile_from_vectors", True),
+    ],
+)
+def test_grdmask_input_arrays(polygon, expected_mask, array_func, method, generic):
+    """
+    Test that C-ordered and Fortran-ordered float64 arrays are passed without copying.
+
+    C-ordered arrays should also skip the data kind detection of
+    Session.virtualfile_in.
+    """
+    with (
+        mock.patch.object(
+            Session, method, autospec=True, side_effect=getattr(Session, method)
+        ) as mock_method,
+        mock.patch.object(
+            Session,
+            "virtualfile_in",
+            autospec=True,
+            side_effect=Session.virtualfile_in,
+        ) as mock_virtualfile_in,
+    ):
+        result = grdmask(data=array_func(polygon), spacing=1, region=[125, 130, 30, 35])
+    mock_method.assert_called_once()
+    assert mock_virtualfile_in.called is generic
+    npt.assert_allclose(result.values, expected_mask)
+
+
+def test_grdmask_input_array_float32(polygon, expected_mask):
+    """
+    Test grdmask with a float32 array.
+    """
+    data = polygon.astype(np.float32)
+    result = grdmask(data=data, spacing=1, region=[125, 130, 30, 35])
+    npt.assert_allclose(result.values, expected_mask)
+
+
+def test_grdmask_input_dataframe(polygon, expected_mask):
+    """
+    Test grdmask with a pandas.DataFrame input.
+    """
+    data = pd.DataFrame(polygon, columns=["x", "y"])
+    result = grdmask(data=data, spacing=1, region=[125, 130, 30, 35])
+    npt.assert_allclose(result.values, expected_mask)
+
+
+def test_grdmask_mask_values(polygon, expected_mask):
+    """
+    Test grdmask with custom outside and inside values.
+    """
+    result = grdmask(
+        data=polygon, spacing=1, region=[125, 130, 30, 35], outside=np.nan, inside=5
+    )
+    npt.assert_allclose(result.values, np.where(expected_mask == 1, 5, np.nan))
+
+
+@pytest.mark.parametrize("prefilter", [True, False])
+def test_grdmask_prefilter(polygon, expected_mask, prefilter):
+    """
+    Test grdmask with polygons outside of the region separated by NaN rows.
+    """
+    outside = polygon + 20.0
+    data = np.vstack([outside, [np.nan, np.nan], polygon, [np.nan, np.nan], outside])
+    result = grdmask(
+        data=data, spacing=1, region=[125, 130, 30, 35], prefilter=prefilter
+    )
+    npt.assert_allclose(result.values, expected_mask)
+
+
+@pytest.mark.parametrize(
+    ("data", "region", "kwargs"),
+    [
+        pytest.param(
+            # The top side of the wide polygon follows a great circle into the region.
+            [
+                [-80, 50],
+                [80, 50],
+                [80, 60],
+                [-80, 60],
+                [-80, 50],
+                [np.nan, np.nan],
+                [-5, 63],
+                [5, 63],
+                [5, 65],
+                [-5, 65],
+                [-5, 63],
+            ],
+            [-10, 10, 62, 70],
+            {"f": "g"},
+            id="geographic",
+        ),
+        pytest.param(
+            # The second point is outside the region but its radius reaches into it.
+            [[127, 32], [np.nan, np.nan], [131, 32]],
+            [125, 130, 30, 35],
+            {"S": 2},
+            id="point_coverage",
+        ),
+        pytest.param(
+            # Dropping the first polygon would renumber the second one.
+            [
+                [140, 40],
+                [141, 40],
+                [141, 41],
+                [140, 40],
+                [np.nan, np.nan],
+                [126.5, 31.5],
+                [128.5, 31.5],
+                [128.5, 33.5],
+                [126.5, 31.5],
+            ],
+            [125, 130, 30, 35],
+            {"N": "p"},
+            id="polygon_ids",
+        ),
+    ],
+)
+def test_grdmask_prefilter_ignored(data, region, kwargs):
+    """
+    Test that the prefilter doesn't change the results when polygons can cover nodes
+    outside their bounding boxes or when polygon IDs are used.
+    """
+    data = np.array(data, dtype=np.float64)
+    expected = grdmask(data=data, spacing=1, region=region, prefilter=False, **kwargs)
+    result = grdmask(data=data, spacing=1, region=region, **kwargs)
+    npt.assert_allclose(result.values, expected.values)
+    result = grdmask_tiled(data=data, spacing=1, region=region, ntiles=2, **kwargs)
+    npt.assert_allclose(result.values, expected.values)
+
+
+def test_grdmask_prefilter_polar_cap():
+    """
+    Test that the prefilter keeps geographic polygons enclosing a pole.
+    """
+    lon = np.arange(-180.0, 180.0, 10.0)
+    ring = np.column_stack([lon, np.full_like(lon, -80.0)])
+    inside = np.array([[-5.0, -89.0], [5.0, -89.0], [5.0, -86.0], [-5.0, -86.0]])
+    far = inside + 100.0
+    nanrow = [[np.nan, np.nan]]
+    data = np.vstack([ring, nanrow, inside, nanrow, far])
+    result = _prefilter_by_region(data, region=[-10, 10, -90, -85])
+    npt.assert_allclose(result, np.vstack([ring, nanrow, inside, nanrow]))
+
+
+def test_grdmask_cache(polygon, expected_mask):
+    """
+    Test that grdmask returns copies of the cached grid for repeated calls.
+    """
+    _GRDMASK_CACHE.clear()
+    kwargs = {"spacing": 1, "region": [125, 130, 30, 35], "cache": True}
+    result1 = grdmask(data=polygon, **kwargs)
+    assert len(_GRDMASK_CACHE) == 1
+    # Modifying the returned grid in place doesn't change the cached grid.
+    result1[:] = -1
+    result2 = grdmask(data=polygon.copy(), **kwargs)
+    assert len(_GRDMASK_CACHE) == 1
+    assert result2.gmt.registration is GridRegistration.GRIDLINE
+    npt.assert_allclose(result2.values, expected_mask)
+    # Different parameters are cached separately.
+    grdmask(data=polygon, inside=5, **kwargs)
+    assert len(_GRDMASK_CACHE) == 2
+    _GRDMASK_CACHE.clear()
+
+
+def test_grdmask_batch(polygon, expected_mask):
+    """
+    Test grdmask_batch with shared polygons and one region for each item.
+    """
+    regions = [[125, 130, 30, 35], [125, 130, 35, 40], [125, 130, 30, 35]]
+    results = list(grdmask_batch(data_iter=[polygon] * 3, spacing=1, region=regions))
+    assert len(results) == 3
+    npt.assert_allclose(results[0].values, expected_mask)
+    npt.assert_allclose(results[1].values, np.zeros(shape=(6, 6)))
+    npt.assert_allclose(results[2].values, expected_mask)
+
+
+def test_grdmask_batch_single_region(polygon, expected_mask):
+    """
+    Test grdmask_batch with different polygons masked onto the same region.
+    """
+    shifted = polygon + 1.0
+    results = list(
+        grdmask_batch(
+            data_iter=[polygon, shifted], spacing=1, region=[125, 130, 30, 35]
+        )
+    )
+    npt.assert_allclose(results[0].values, expected_mask)
+    npt.assert_allclose(results[1].values, np.roll(expected_mask, (1, 1), (0, 1)))
+
+
+def test_grdmask_batch_stringio(polygon, expected_mask):
+    """
+    Test grdmask_batch with the same io.StringIO object repeated for each item.
+    """
+    data = io.StringIO("\n".join(f"{x} {y}" for x, y in polygon))
+    results = list(
+        grdmask_batch(data_iter=[data] * 2, spacing=1, region=[125, 130, 30, 35])
+    )
+    npt.assert_allclose(results[0].values, expected_mask)
+    npt.assert_allclose(results[1].values, expected_mask)
+
+
+@pytest.mark.parametrize("registration", ["gridline", "pixel"])
+def test_grdmask_tiled(polygon, registration):
+    """
+    Test that grdmask_tiled gives the same grid as grdmask.
+    """
+    kwargs = {
+        "spacing": 0.5,
+        "region": [120, 135, 25, 40],
+        "registration": registration,
+    }
+    data = np.vstack([polygon, [np.nan, np.nan], polygon + 5.0])
+    expected = grdmask(data=data, **kwargs)
+    result = grdmask_tiled(data=data, ntiles=3, **kwargs)
+    assert result.dims == expected.dims
+    assert result.gmt.registration == expected.gmt.registration
+    xr.testing.assert_allclose(a=result, b=expected)
+    # The history attribute differs since each band is masked with its own region.
+    npt.assert_equal(result.attrs["actual_range"], expected.attrs["actual_range"])
+    for dim in result.dims:
+        npt.assert_equal(result[dim].attrs, expected[dim].attrs)
+
+
+def test_grdmask_tiled_single_band(polygon):
+    """
+    Test that grdmask_tiled masks the whole region at once without an executor.
+    """
+    kwargs = {"spacing": 1, "region": [125, 130, 30, 35]}
+    expected = grdmask(data=polygon, **kwargs)
+    result = grdmask_tiled(data=polygon, **kwargs)
+    # The attributes (e.g., history) only match if the region is masked in one call.
+    xr.testing.assert_identical(a=result, b=expected)
+
+
+def _reload_pygmt():
+    """
+    Re-import PyGMT in each worker process.
+
+    Workaround from
+    https://github.com/GenericMappingTools/pygmt/issues/217#issuecomment-754774875.
+    """
+    import pygmt  # noqa: PLC0415
+
+    reload(pygmt)
+
+
+def test_grdmask_tiled_processes(polygon):
+    """
+    Test grdmask_tiled with the bands masked in separate processes.
+    """
+    kwargs = {"spacing": 1, "region": [125, 130, 30, 35], "registration": "pixel"}
+    expected = grdmask(data=polygon, **kwargs)
+    with ProcessPoolExecutor(max_workers=2, initializer=_reload_pygmt) as executor:
+        result = grdmask_tiled(data=polygon, ntiles=2, executor=executor, **kwargs)
+    assert result.gmt.registration is GridRegistration.PIXEL
+    xr.testing.assert_allclose(a=result, b=expected)
+
+
+def test_grdmask_fails(polygon):
+    """
+    Check that grdmask fails correctly when region and spacing are not given.
+    """
+    with pytest.raises(GMTParameterError):
+        grdmask(data=polygon)
+    with pytest.raises(GMTParameterError):
+        grdmask_batch(data_iter=[polygon])
+    with pytest.raises(GMTParameterError):
+        grdmask_tiled(data=polygon)
+    with pytest.raises(GMTParameterError):
+        grdmask_tiled(
+            data=polygon, spacing=1, region=[125, 130, 30, 35], outgrid="a.nc"
+        )
+    with pytest.raises(GMTValueError):
+        grdmask_tiled(data=polygon, spacing=1, region="g")
+    with pytest.raises(GMTValueError):
+        grdmask_tiled(data=polygon, spacing=1, region=[125, 130, 30, 35.5], ntiles=2)
+    with ThreadPoolExecutor() as executor, pytest.raises(GMTValueError):
+        grdmask_tiled(
+            data=polygon, spacing=1, region=[125, 130, 30, 35], executor=executor
+        )